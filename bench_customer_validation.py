@@ -0,0 +1,50 @@
+import time
+import random
+
+from utils.customer_validation import validate_customers, validate_customer_updates
+
+ROWS = 100_000
+
+
+def make_customers(rows):
+    """
+    Build a bulk create payload with a mix of valid and invalid customers.
+    """
+    customers = []
+    for i in range(rows):
+        customer = {
+            "name": f"Customer {i}",
+            "email": f"  Customer{i}@Example.COM ",
+            "phone": f"({random.randint(200, 999)}) {random.randint(100, 999)}-{i % 10000:04d}",
+            "street": f"{i} Main St",
+            "city": "Springfield",
+            "state": "Illinois",
+            "country": "United States",
+            "zip": "62701",
+        }
+        # Every 100th row is invalid
+        if i % 100 == 0:
+            customer["email"] = "not-an-email"
+            customer["nickname"] = "unknown field"
+        customers.append(customer)
+    return customers
+
+
+def bench(name, func, payload):
+    start = time.perf_counter()
+    normalized, errors = func(payload)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name}: {len(payload)} rows in {elapsed:.3f}s "
+        f"({len(payload) / elapsed:,.0f} rows/s, {len(errors)} errors)"
+    )
+
+
+if __name__ == "__main__":
+    customers = make_customers(ROWS)
+    updates = [
+        {"id": i + 1, "values": customer} for i, customer in enumerate(customers)
+    ]
+
+    bench("validate_customers", validate_customers, customers)
+    bench("validate_customer_updates", validate_customer_updates, updates)
@@ -3,7 +3,8 @@ import logging
 from odoo_client import OdooClient
 from flask import Blueprint, request, jsonify
 from flasgger import swag_from
-from utils.customer_helpers import create_customer, update_customer
+from utils.customer_helpers import create_customer, update_customer, escape_like
+from utils.customer_validation import validate_customers, validate_customer_updates
 
 customer_bp = Blueprint("customer", __name__)
 client = OdooClient()
@@ -16,6 +17,27 @@ logging.basicConfig(
 )
 
 
+def validation_error(errors):
+    """
+    Build a 400 response listing every validation error in the payload.
+    Args:
+        errors (list): List of {"index", "field", "message"} dictionaries.
+    Returns:
+        A tuple containing a JSON object and a status code.
+    """
+    logging.error(f"Validation failed with {len(errors)} error(s): {errors[:10]} \n")
+    return (
+        jsonify(
+            {
+                "status": "error",
+                "message": errors[0]["message"],
+                "errors": errors,
+            }
+        ),
+        400,
+    )
+
+
 @customer_bp.route("/", methods=["GET"])
 @swag_from("../swagger/all_customers.yml")
 def index():
@@ -110,26 +132,25 @@ def create():
     data = request.json
     logging.info(f"Request to create customer received: {data} \n")
 
-    # Validate that either phone or email is provided - both being provided is also valid
-    if not data.get("phone") and not data.get("email"):
-        logging.error(f"Either phone or email must be provided \n")
-        return (
-            jsonify(
-                {
-                    "status": "error",
-                    "message": "Either phone or email must be provided.",
-                }
-            ),
-            400,
-        )
+    # Validate that name and either phone or email are provided - both being provided is also valid
+    # Email and phone are normalized before they are stored, keeping the phone as sent for the duplicate check
+    customers, errors = validate_customers([data])
+    if errors:
+        return validation_error(errors)
+    raw_phone = data.get("phone")
+    data = customers[0]
 
     try:
         # Handles only if phone or email or both are provided
+        # Customers created before normalization may hold mixed-case emails and formatted phones,
+        # so emails are matched case-insensitively and phones in both the normalized and sent form
         filter_conditions = []
         if data.get("email"):
-            filter_conditions.append(("email", "=", data["email"]))
+            filter_conditions.append(("email", "=ilike", escape_like(data["email"])))
         if data.get("phone"):
-            filter_conditions.append(("phone", "=", data["phone"]))
+            filter_conditions.append(
+                ("phone", "in", list({data["phone"], raw_phone.strip()}))
+            )
 
         # If both phone and email are provided
         if len(filter_conditions) == 2:
@@ -199,6 +220,11 @@ def update():
             400,
         )
 
+    updates, errors = validate_customer_updates([data])
+    if errors:
+        return validation_error(errors)
+    data = updates[0]
+
     try:
         # Check if the customer exists
         customer_exists = client.execute(
@@ -252,22 +278,10 @@ def bulk_create_customers():
             400,
         )
 
-    for customer in data:
-        if not customer.get("name") or (
-            not customer.get("phone") and not customer.get("email")
-        ):
-            logging.error(
-                f"Each customer must include 'name' and either 'phone' or 'email' \n"
-            )
-            return (
-                jsonify(
-                    {
-                        "status": "error",
-                        "message": "Each customer must include 'name' and either 'phone' or 'email'.",
-                    }
-                ),
-                400,
-            )
+    # Validate and normalize every customer in one pass, reporting all errors at once
+    data, errors = validate_customers(data)
+    if errors:
+        return validation_error(errors)
 
     try:
         created_customers = []
@@ -317,32 +331,10 @@ def bulk_update_customers():
             400,
         )
 
-    # Validate the input - check that each customer object has an ID and values
-    for customer in data:
-        #  if no customer Id or values are provided, dont proceed and return an error
-        if not customer.get("id") or not customer.get("values"):
-            logging.error(f"Each customer must include 'id' and 'values' \n")
-            return (
-                jsonify(
-                    {
-                        "status": "error",
-                        "message": "Each customer must include 'id' and 'at least 1 key: value'.",
-                    }
-                ),
-                400,
-            )
-        # if the values are not a dictionary, return an error
-        if not isinstance(customer["values"], dict):
-            logging.error(f"Values must be a dictionary \n")
-            return (
-                jsonify(
-                    {
-                        "status": "error",
-                        "message": "Values must be a dictionary.",
-                    }
-                ),
-                400,
-            )
+    # Validate and normalize every update in one pass, reporting all errors at once
+    data, errors = validate_customer_updates(data)
+    if errors:
+        return validation_error(errors)
 
     try:
         for customer in data:
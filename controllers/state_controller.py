@@ -1,9 +1,24 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from flasgger import swag_from
 from odoo_client import OdooClient
+from utils.state_index import StateIndex, serialize
 
 state_bp = Blueprint("state", __name__)
 client = OdooClient()
+state_index = StateIndex(client)
+
+# Largest page size a client can request
+MAX_PER_PAGE = 500
+
+
+def json_response(body, total=None):
+    """
+    Build a 200 OK response from pre-serialized JSON bytes.
+    """
+    response = Response(body, status=200, mimetype="application/json")
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return response
 
 
 @state_bp.route("/", methods=["GET"])
@@ -12,36 +27,89 @@ def index():
     """
     Get states.
 
-    This function fetches states based on the provided query parameters.
-    If no parameters are provided, it fetches all states.
+    This function fetches states from the in-memory state index based on the provided query parameters.
+    If no parameters are provided, it returns all states.
+    The responses for all states and for each country are serialized ahead of time.
 
     Returns:
-        A tuple containing a JSON object and a status code.
+        A Response with the JSON array of states, or a tuple containing a JSON error object and a status code.
     """
+    # Get query parameters
+    state_name = request.args.get("name")
+    state_id = request.args.get("id")
+    country = request.args.get("country")
+    match = request.args.get("match", "substring")
+    page = request.args.get("page")
+    per_page = request.args.get("per_page")
+
+    # Validate the query parameters
+    if state_id and not state_id.isdecimal():
+        return jsonify({"status": "error", "message": "'id' must be an integer."}), 400
+    if match not in ("prefix", "substring"):
+        return (
+            jsonify(
+                {
+                    "status": "error",
+                    "message": "'match' must be either 'prefix' or 'substring'.",
+                }
+            ),
+            400,
+        )
+    if any(
+        value and (not value.isdecimal() or int(value) < 1)
+        for value in (page, per_page)
+    ):
+        return (
+            jsonify(
+                {
+                    "status": "error",
+                    "message": "'page' and 'per_page' must be positive integers.",
+                }
+            ),
+            400,
+        )
+    if per_page and int(per_page) > MAX_PER_PAGE:
+        return (
+            jsonify(
+                {
+                    "status": "error",
+                    "message": f"'per_page' must be at most {MAX_PER_PAGE}.",
+                }
+            ),
+            400,
+        )
+
     try:
-        # Get query parameters
-        state_name = request.args.get("name")
-        state_id = request.args.get("id")
-        filter_conditions = []
-
-        # If state name is provided, add to the search filter_conditions
-        if state_name:
-            filter_conditions.append(("name", "ilike", state_name))
-
-        # If state id is provided, add to the search filter_conditions
-        if state_id:
-            filter_conditions.append(("id", "=", int(state_id)))
-
-        # Fetch states
-        states = client.execute(
-            "res.country.state",
-            "search_read",
-            filter_conditions,
-            ["id", "name", "country_id"],
+        # Resolve the country filter (ID or name) to a country ID
+        country_id = None
+        if country:
+            country_id = state_index.country_id(country)
+            if country_id is None:
+                return json_response(b"[]", total=0)
+
+        paginate = bool(page or per_page)
+
+        # Unfiltered and per-country queries are served from the pre-serialized responses
+        if not state_name and not state_id and not paginate:
+            return json_response(state_index.cached_bytes(country_id))
+
+        states = state_index.search(
+            name=state_name,
+            state_id=int(state_id) if state_id else None,
+            country_id=country_id,
+            match=match,
         )
 
-        # Return the states in JSON format with a 200 OK status code
-        return jsonify(states), 200
+        if not paginate:
+            return json_response(serialize(states))
+
+        # Paginate the results - pages start at 1
+        page = int(page or 1)
+        per_page = int(per_page or 50)
+        start = (page - 1) * per_page
+        return json_response(
+            serialize(states[start : start + per_page]), total=len(states)
+        )
 
     except Exception as e:
         # If an error occurred, return the error message in JSON format with a 500 Internal Server Error status code
@@ -2,13 +2,15 @@ from flask import Flask
 from flasgger import Swagger
 from odoo_client import OdooClient
 from db_name_scraper import get_current_database_name, update_env_file
-from controllers.state_controller import state_bp
+from controllers.state_controller import state_bp, state_index
 from controllers.customer_controller import customer_bp
+from utils.profiler import init_profiling
 
 
 def create_app():
     app = Flask(__name__)
     Swagger(app)
+    init_profiling(app)
 
     app.register_blueprint(customer_bp, url_prefix="/customers")
     app.register_blueprint(state_bp, url_prefix="/states")
@@ -19,4 +21,7 @@ def create_app():
     print("OdooClient initialized")
     OdooClient()
 
+    # Build the in-memory state index now and keep it up to date with Odoo
+    state_index.start_refresh()
+
     return app
@@ -0,0 +1,198 @@
+import importlib
+
+import pytest
+from flask import Flask
+
+import odoo_client
+
+from utils import customer_validation
+from utils.customer_validation import (
+    normalize_email,
+    normalize_phone,
+    validate_customers,
+    validate_customer_updates,
+)
+
+
+@pytest.mark.parametrize(
+    "email, expected",
+    [
+        ("  Foo@Example.COM ", "foo@example.com"),
+        ("first_last@example.co.uk", "first_last@example.co.uk"),
+        ("not-an-email", None),
+        ("foo@example", None),
+        ("foo bar@example.com", None),
+    ],
+)
+def test_normalize_email(email, expected):
+    assert normalize_email(email) == expected
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("(555) 123-4567", "+15551234567"),
+        ("555.123.4567", "+15551234567"),
+        ("1-800-555-1234", "+18005551234"),
+        ("1 (555) 123-4567", "+15551234567"),
+        ("+1 555 123 4567", "+15551234567"),
+        ("+44 20 7946 0958", "+442079460958"),
+        ("+44 (0)20 7946 0958", "+442079460958"),
+        ("0044 20 7946 0958", "+442079460958"),
+        # National UK number with trunk 0 is not a valid US number
+        ("020 7946 0958", None),
+        # 7-digit local number without an area code
+        ("555-1234", None),
+        # US area codes cannot start with 0 or 1
+        ("+1 055 123 4567", None),
+        ("+1 555 123 456", None),
+        ("555-123-4567 ext 2", None),
+        ("12", None),
+    ],
+)
+def test_normalize_phone_default_us(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("020 7946 0958", "+442079460958"),
+        ("20 7946 0958", "+442079460958"),
+        ("+44 (0)20 7946 0958", "+442079460958"),
+        ("+1 (555) 123-4567", "+15551234567"),
+        # Could be a national number or one that already includes 44
+        ("44 20 7946 0958", None),
+    ],
+)
+def test_normalize_phone_default_uk(monkeypatch, phone, expected):
+    monkeypatch.setattr(customer_validation, "DEFAULT_PHONE_COUNTRY_CODE", "44")
+    assert normalize_phone(phone) == expected
+
+
+def test_validate_customers_normalizes_valid_rows():
+    customers, errors = validate_customers(
+        [
+            {
+                "name": "Jane",
+                "email": " Jane@Example.com",
+                "phone": "(555) 123-4567",
+                "city": "Springfield",
+            }
+        ]
+    )
+
+    assert errors == []
+    assert customers == [
+        {
+            "name": "Jane",
+            "email": "jane@example.com",
+            "phone": "+15551234567",
+            "city": "Springfield",
+        }
+    ]
+
+
+def test_validate_customers_reports_every_row():
+    customers, errors = validate_customers(
+        [
+            {"name": "Valid", "email": "valid@example.com"},
+            {"email": "bad-email", "nickname": "x"},
+            {"name": "No contact"},
+            "not a customer",
+            {"name": "Bad phone", "phone": "555-1234", "zip": 12345},
+            {"name": "Null phone", "phone": None, "email": "null@example.com"},
+        ]
+    )
+
+    assert [(error["index"], error["field"]) for error in errors] == [
+        (1, "name"),
+        (1, "email"),
+        (1, "nickname"),
+        (2, None),
+        (3, None),
+        (4, "phone"),
+        (4, "zip"),
+    ]
+    assert customers[0] == {"name": "Valid", "email": "valid@example.com"}
+    assert customers[-1] == {"name": "Null phone", "email": "null@example.com"}
+
+
+def test_validate_customer_updates():
+    updates, errors = validate_customer_updates(
+        [
+            {"id": "42", "values": {"email": "New@Example.com"}},
+            {"id": 7, "values": {"phone": "1-800-555-1234"}},
+            {"id": True, "values": {"city": "Springfield"}},
+            {"id": 8, "values": {}},
+            {"id": 9, "values": {"password": "secret"}},
+        ]
+    )
+
+    assert updates[:2] == [
+        {"id": 42, "values": {"email": "new@example.com"}},
+        {"id": 7, "values": {"phone": "+18005551234"}},
+    ]
+    assert [(error["index"], error["field"]) for error in errors] == [
+        (2, "id"),
+        (3, "values"),
+        (4, "password"),
+    ]
+
+
+class StubClient:
+    """
+    Stands in for OdooClient, recording calls and finding no existing customers.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, model, method, *args):
+        self.calls.append((model, method, args))
+        return [] if method == "search" else 1
+
+
+@pytest.fixture
+def customer_client(monkeypatch):
+    """
+    Test client for the customers blueprint, backed by StubClient.
+    """
+    monkeypatch.setattr(odoo_client, "OdooClient", StubClient)
+    customer_controller = importlib.import_module("controllers.customer_controller")
+    stub = StubClient()
+    monkeypatch.setattr(customer_controller, "client", stub)
+    monkeypatch.setattr(customer_controller, "create_customer", lambda data: 1)
+
+    app = Flask(__name__)
+    app.register_blueprint(customer_controller.customer_bp, url_prefix="/customers")
+    return app.test_client(), stub
+
+
+def test_create_reports_every_error(customer_client):
+    client, _ = customer_client
+
+    response = client.post("/customers/", json={"nickname": "x"})
+
+    assert response.status_code == 400
+    assert [
+        (error["field"], error["message"]) for error in response.get_json()["errors"]
+    ] == [
+        ("name", "'name' is required."),
+        (None, "Either 'phone' or 'email' must be provided."),
+        ("nickname", "Unknown field 'nickname'."),
+    ]
+
+
+def test_create_duplicate_check_uses_normalized_values(customer_client):
+    client, stub = customer_client
+
+    response = client.post(
+        "/customers/",
+        json={"name": "Jane", "email": "Jane_Doe@Example.com", "phone": None},
+    )
+
+    assert response.status_code == 200
+    assert stub.calls == [
+        ("res.partner", "search", ([("email", "=ilike", "jane\\_doe@example.com")],))
+    ]
@@ -0,0 +1,123 @@
+import os
+import threading
+
+import pytest
+from flask import Flask
+
+from utils import profiler
+
+
+@pytest.fixture
+def make_client(monkeypatch, tmp_path):
+    """
+    Build a small Flask app with profiling configured by the given settings.
+    """
+
+    def make(token="secret", sample_rate=0, format="pstats"):
+        monkeypatch.setattr(profiler, "PROFILE_TOKEN", token)
+        monkeypatch.setattr(profiler, "PROFILE_SAMPLE_RATE", sample_rate)
+        monkeypatch.setattr(profiler, "PROFILE_FORMAT", format)
+        monkeypatch.setattr(profiler, "PROFILE_DIR", str(tmp_path))
+
+        app = Flask(__name__)
+        app.config["PROPAGATE_EXCEPTIONS"] = True
+        profiler.init_profiling(app)
+
+        @app.route("/ok")
+        def ok():
+            return "ok"
+
+        @app.route("/boom")
+        def boom():
+            raise RuntimeError("boom")
+
+        return app, app.test_client()
+
+    return make
+
+
+def profiles(tmp_path):
+    return sorted(os.listdir(tmp_path))
+
+
+def test_hooks_not_registered_when_disabled(make_client):
+    app, _ = make_client(token="", sample_rate=0)
+
+    assert profiler.start_profiling not in app.before_request_funcs.get(None, [])
+    assert profiler.stop_profiling not in app.teardown_request_funcs.get(None, [])
+
+
+@pytest.mark.parametrize(
+    "headers, profiled",
+    [
+        ({"HTTP_X_PROFILE_TOKEN": "secret"}, True),
+        ({"HTTP_X_PROFILE_TOKEN": "wrong"}, False),
+        ({"HTTP_X_PROFILE_TOKEN": "\xe9"}, False),
+        ({}, False),
+    ],
+)
+def test_token_header(make_client, tmp_path, headers, profiled):
+    _, client = make_client()
+
+    response = client.get("/ok", environ_overrides=headers)
+
+    assert response.status_code == 200
+    assert len(profiles(tmp_path)) == (1 if profiled else 0)
+
+
+def test_pstats_profile_written(make_client, tmp_path):
+    _, client = make_client()
+
+    client.get("/ok", headers={"X-Profile-Token": "secret"})
+
+    [name] = profiles(tmp_path)
+    assert name.endswith(".prof")
+    assert "-GET-ok-" in name
+
+
+def test_collapsed_profile_written(make_client, tmp_path):
+    _, client = make_client(format="collapsed")
+
+    client.get("/ok", headers={"X-Profile-Token": "secret"})
+
+    [name] = profiles(tmp_path)
+    assert name.endswith(".folded")
+
+
+@pytest.mark.parametrize("format, ext", [("pstats", ".prof"), ("collapsed", ".folded")])
+def test_profiler_stopped_when_handler_raises(make_client, tmp_path, format, ext):
+    _, client = make_client(format=format)
+    threads = threading.active_count()
+
+    with pytest.raises(RuntimeError):
+        client.get("/boom", headers={"X-Profile-Token": "secret"})
+
+    [name] = profiles(tmp_path)
+    assert name.endswith(ext)
+    assert not profiler.cprofile_lock.locked()
+    assert threading.active_count() == threads
+
+
+def test_skips_cprofile_while_another_profile_runs(make_client, tmp_path):
+    _, client = make_client()
+
+    with profiler.cprofile_lock:
+        response = client.get("/ok", headers={"X-Profile-Token": "secret"})
+
+    assert response.status_code == 200
+    assert profiles(tmp_path) == []
+
+
+def test_start_errors_do_not_fail_request(make_client, monkeypatch, tmp_path):
+    _, client = make_client()
+
+    def fail():
+        raise ValueError("another profiler is active")
+
+    monkeypatch.setattr(profiler.cProfile.Profile, "enable", lambda self: fail())
+
+    response = client.get("/ok", headers={"X-Profile-Token": "secret"})
+
+    assert response.status_code == 200
+    assert profiles(tmp_path) == []
+    assert not profiler.cprofile_lock.locked()
@@ -0,0 +1,195 @@
+import json
+import importlib
+
+import pytest
+from flask import Flask
+
+import odoo_client
+from utils.state_index import StateIndex
+
+STATES = [
+    {"id": 1, "name": "Texas", "country_id": [233, "United States"]},
+    {"id": 2, "name": "Tamil Nadu", "country_id": [104, "India"]},
+    {"id": 3, "name": "Utah", "country_id": [233, "United States"]},
+    {"id": 4, "name": "Tennessee", "country_id": [233, "United States"]},
+    {"id": 5, "name": "Tasmania", "country_id": [13, "Australia"]},
+    {"id": 6, "name": "Tarapacá", "country_id": [46, "Chile"]},
+    {"id": 7, "name": "Territory", "country_id": False},
+]
+
+
+class StubClient:
+    """
+    Stands in for OdooClient, returning a fixed search_read result.
+    """
+
+    def __init__(self, states=STATES, fail=False):
+        self.states = states
+        self.fail = fail
+        self.calls = 0
+
+    def execute(self, model, method, *args):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("Odoo is down")
+        return [dict(state) for state in self.states]
+
+
+def ids(states):
+    return [state["id"] for state in states]
+
+
+@pytest.fixture
+def index():
+    return StateIndex(StubClient())
+
+
+def test_states_are_sorted_by_name(index):
+    assert ids(index.search()) == [2, 6, 5, 4, 7, 1, 3]
+
+
+def test_substring_search_is_case_insensitive(index):
+    assert ids(index.search(name="TA")) == [2, 6, 5, 3]
+
+
+@pytest.mark.parametrize("prefix", ["t", "ta", "TE", "tas", "tarapacá", "x", ""])
+def test_prefix_search_bisect_matches_list_scan(index, prefix):
+    # Without a country filter prefix search goes through bisect, with one it scans a list
+    bisected = index.search(name=prefix, match="prefix")
+    scanned = [
+        state
+        for country_id in (233, 104, 13, 46)
+        for state in index.search(name=prefix, country_id=country_id, match="prefix")
+    ]
+    territory = [state for state in bisected if not state["country_id"]]
+
+    assert sorted(ids(bisected)) == sorted(ids(scanned + territory))
+    assert all(state["name"].lower().startswith(prefix.lower()) for state in bisected)
+
+
+def test_prefix_search_bisect_range(index):
+    assert ids(index.search(name="te", match="prefix")) == [4, 7, 1]
+    assert ids(index.search(name="tarapacá", match="prefix")) == [6]
+    assert index.search(name="zz", match="prefix") == []
+
+
+def test_search_by_country(index):
+    assert ids(index.search(country_id=233)) == [4, 1, 3]
+    assert ids(index.search(name="t", country_id=233, match="prefix")) == [4, 1]
+    assert index.search(country_id=999) == []
+
+
+def test_search_by_state_id(index):
+    assert ids(index.search(state_id=2)) == [2]
+    assert index.search(state_id=999) == []
+    # A state ID is only matched if it belongs to the given country
+    assert ids(index.search(state_id=1, country_id=233)) == [1]
+    assert index.search(state_id=1, country_id=104) == []
+    assert index.search(state_id=7, country_id=233) == []
+
+
+def test_country_id_by_id_or_name(index):
+    assert index.country_id("233") == 233
+    assert index.country_id("United States") == 233
+    assert index.country_id("united states") == 233
+    assert index.country_id("Atlantis") is None
+    # Non-ASCII digits are not treated as an ID
+    assert index.country_id("²") is None
+
+
+def test_cached_bytes(index):
+    assert json.loads(index.cached_bytes()) == index.search()
+    assert json.loads(index.cached_bytes(233)) == index.search(country_id=233)
+    assert index.cached_bytes(999) == b"[]"
+
+
+def test_interval_must_be_positive():
+    with pytest.raises(ValueError):
+        StateIndex(StubClient(), interval=0)
+
+
+def test_start_refresh_builds_index_once_and_is_idempotent():
+    client = StubClient()
+    index = StateIndex(client, interval=3600)
+
+    index.start_refresh()
+    timer = index._timer
+    index.start_refresh()
+
+    assert client.calls == 1
+    assert index._timer is timer
+    assert ids(index.search(state_id=1)) == [1]
+    timer.cancel()
+
+
+def test_start_refresh_logs_errors():
+    index = StateIndex(StubClient(fail=True), interval=3600)
+
+    index.start_refresh()
+
+    assert index._snapshot is None
+    index._timer.cancel()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """
+    Test client for the states blueprint, backed by a StateIndex over StubClient.
+    """
+    monkeypatch.setattr(odoo_client, "OdooClient", StubClient)
+    state_controller = importlib.import_module("controllers.state_controller")
+    monkeypatch.setattr(state_controller, "state_index", StateIndex(StubClient()))
+
+    app = Flask(__name__)
+    app.register_blueprint(state_controller.state_bp, url_prefix="/states")
+    return app.test_client()
+
+
+def test_states_endpoint_unfiltered_and_by_country(client):
+    response = client.get("/states/")
+    assert response.status_code == 200
+    assert ids(response.get_json()) == [2, 6, 5, 4, 7, 1, 3]
+
+    response = client.get("/states/?country=united states")
+    assert ids(response.get_json()) == [4, 1, 3]
+
+    response = client.get("/states/?country=Atlantis")
+    assert response.get_json() == []
+    assert response.headers["X-Total-Count"] == "0"
+
+
+def test_states_endpoint_pagination(client):
+    response = client.get("/states/?page=1&per_page=3")
+    assert ids(response.get_json()) == [2, 6, 5]
+    assert response.headers["X-Total-Count"] == "7"
+
+    response = client.get("/states/?page=3&per_page=3")
+    assert ids(response.get_json()) == [3]
+
+    response = client.get("/states/?page=4&per_page=3")
+    assert response.get_json() == []
+    assert response.headers["X-Total-Count"] == "7"
+
+    response = client.get("/states/?name=t&match=prefix&country=233&per_page=1")
+    assert ids(response.get_json()) == [4]
+    assert response.headers["X-Total-Count"] == "2"
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "page=0",
+        "per_page=0",
+        "page=²",
+        "per_page=-1",
+        "per_page=501",
+        "id=²",
+        "id=abc",
+        "match=fuzzy",
+    ],
+)
+def test_states_endpoint_rejects_bad_parameters(client, query):
+    response = client.get(f"/states/?{query}")
+
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
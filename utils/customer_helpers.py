@@ -22,6 +22,16 @@ def get_id(values, key, get_id_func):
             raise ValueError(f"Invalid {key} '{name}': {e}")
 
 
+def escape_like(value):
+    """
+    Helper function to escape the LIKE wildcards in a value used with Odoo's =like/=ilike operators.
+    Without this an underscore in an email (e.g. first_last@example.com) would match any character.
+    Example:
+        first_last@example.com -> first\\_last@example.com
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def create_customer(data):
     """
     Helper function to create a customer.
@@ -0,0 +1,240 @@
+# utils/customer_validation.py
+import os
+import re
+
+# Country calling code used for phone numbers that are sent without one (e.g. "1" for US/Canada)
+DEFAULT_PHONE_COUNTRY_CODE = os.getenv("DEFAULT_PHONE_COUNTRY_CODE", "1")
+
+# res.partner fields accepted from the API - the same fields create_customer sends to Odoo
+# (state and country are given by name and resolved to state_id and country_id)
+CUSTOMER_FIELDS = frozenset(
+    ["name", "phone", "email", "street", "city", "state", "country", "zip"]
+)
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# Characters people use to format phone numbers: spaces, dashes, dots, brackets
+PHONE_FORMATTING_RE = re.compile(r"[\s\-.()/]")
+PHONE_DIGITS_RE = re.compile(r"^\+?\d+$")
+E164_RE = re.compile(r"^\+[1-9]\d{6,14}$")
+
+# National trunk prefix dialled before a national number (NANP uses 1, most others 0)
+TRUNK_PREFIXES = {"1": "1"}
+# National number formats for country codes where the length is fixed.
+# NANP (+1): 10 digits and the area code cannot start with 0 or 1
+NATIONAL_NUMBER_RE = {"1": re.compile(r"^[2-9]\d{9}$")}
+
+
+def normalize_email(email):
+    """
+    Normalize an email address.
+    Returns:
+        str: The trimmed, lowercased email, or None if it is not a valid address.
+    """
+    email = email.strip().lower()
+    return email if EMAIL_RE.match(email) else None
+
+
+def add_country_code(number):
+    """
+    Turn a national phone number (digits only) into an international one using
+    DEFAULT_PHONE_COUNTRY_CODE. A leading trunk prefix is dropped, and a number that
+    already starts with the country code is not given it twice.
+    Returns:
+        str: The country code followed by the national number, or None if the number
+            does not fit the national format or it is ambiguous whether it already
+            includes the country code.
+    """
+    code = DEFAULT_PHONE_COUNTRY_CODE
+    trunk = TRUNK_PREFIXES.get(code, "0")
+    national_re = NATIONAL_NUMBER_RE.get(code)
+
+    if national_re:
+        # The national length is known, so a number with the country code in front can be told apart
+        if number.startswith(code) and national_re.match(number[len(code) :]):
+            return number
+        if number.startswith(trunk) and national_re.match(number[len(trunk) :]):
+            return code + number[len(trunk) :]
+        return code + number if national_re.match(number) else None
+
+    if number.startswith(trunk):
+        return code + number[len(trunk) :]
+    # Without a known national length this could be a national number or one with the code already
+    if number.startswith(code):
+        return None
+    return code + number
+
+
+def normalize_phone(phone):
+    """
+    Normalize a phone number to E.164 format (+<country code><number>).
+    Numbers starting with + or 00 are international, and a "(0)" trunk prefix in them is dropped.
+    Other numbers are national and get DEFAULT_PHONE_COUNTRY_CODE (see add_country_code).
+    Example:
+        "(555) 123-4567" -> "+15551234567"
+        "1-800-555-1234" -> "+18005551234"
+        "+44 (0)20 7946 0958" -> "+442079460958"
+    Returns:
+        str: The normalized phone number, or None if it is not a valid or unambiguous number.
+    """
+    phone = PHONE_FORMATTING_RE.sub("", phone.replace("(0)", ""))
+    if not PHONE_DIGITS_RE.match(phone):
+        return None
+
+    if phone.startswith("+"):
+        phone = phone[1:]
+    elif phone.startswith("00"):
+        phone = phone[2:]
+    else:
+        phone = add_country_code(phone)
+        if phone is None:
+            return None
+
+    # International numbers for a country with a known national format must match it
+    for code, national_re in NATIONAL_NUMBER_RE.items():
+        if phone.startswith(code) and not national_re.match(phone[len(code) :]):
+            return None
+
+    phone = "+" + phone
+    return phone if E164_RE.match(phone) else None
+
+
+def normalize_values(values, index, errors):
+    """
+    Check the fields of a single customer against CUSTOMER_FIELDS and normalize email and phone.
+    Every problem found is appended to errors instead of stopping at the first one.
+    Args:
+        values (dict): The customer fields.
+        index (int): Position of the customer in the payload, used in the error report.
+        errors (list): Error report to append to.
+    Returns:
+        dict: A normalized copy of values.
+    """
+    normalized = {}
+    for field, value in values.items():
+        if field not in CUSTOMER_FIELDS:
+            errors.append(
+                {"index": index, "field": field, "message": f"Unknown field '{field}'."}
+            )
+            continue
+        # null is treated like a field that was not sent
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            errors.append(
+                {"index": index, "field": field, "message": "Value must be a string."}
+            )
+            continue
+
+        # Empty values are passed through unchanged
+        if value and field == "email":
+            email = normalize_email(value)
+            if email is None:
+                errors.append(
+                    {
+                        "index": index,
+                        "field": field,
+                        "message": f"Invalid email '{value}'.",
+                    }
+                )
+                continue
+            value = email
+        elif value and field == "phone":
+            phone = normalize_phone(value)
+            if phone is None:
+                errors.append(
+                    {
+                        "index": index,
+                        "field": field,
+                        "message": f"Invalid phone number '{value}'.",
+                    }
+                )
+                continue
+            value = phone
+
+        normalized[field] = value
+    return normalized
+
+
+def validate_customers(customers):
+    """
+    Validate and normalize a payload of customers to create in one pass.
+    Each customer must include 'name' and either 'phone' or 'email'.
+    Args:
+        customers (list): List of dictionaries containing customer details.
+    Returns:
+        tuple: (normalized customers, errors) where errors is a list of
+            {"index", "field", "message"} dictionaries covering every row.
+    """
+    normalized = []
+    errors = []
+    for index, customer in enumerate(customers):
+        if not isinstance(customer, dict):
+            errors.append(
+                {
+                    "index": index,
+                    "field": None,
+                    "message": "Customer must be an object.",
+                }
+            )
+            continue
+
+        if not customer.get("name"):
+            errors.append(
+                {"index": index, "field": "name", "message": "'name' is required."}
+            )
+        if not customer.get("phone") and not customer.get("email"):
+            errors.append(
+                {
+                    "index": index,
+                    "field": None,
+                    "message": "Either 'phone' or 'email' must be provided.",
+                }
+            )
+
+        normalized.append(normalize_values(customer, index, errors))
+    return normalized, errors
+
+
+def validate_customer_updates(updates):
+    """
+    Validate and normalize a payload of customer updates in one pass.
+    Each update must include an integer 'id' and a non-empty 'values' dictionary.
+    Args:
+        updates (list): List of {"id": int, "values": dict} dictionaries.
+    Returns:
+        tuple: (normalized updates, errors) where errors is a list of
+            {"index", "field", "message"} dictionaries covering every row.
+    """
+    normalized = []
+    errors = []
+    for index, update in enumerate(updates):
+        if not isinstance(update, dict):
+            errors.append(
+                {"index": index, "field": None, "message": "Update must be an object."}
+            )
+            continue
+
+        # IDs may also be sent as strings of digits, e.g. "42"
+        customer_id = update.get("id")
+        if isinstance(customer_id, str) and customer_id.isdigit():
+            customer_id = int(customer_id)
+        if not isinstance(customer_id, int) or isinstance(customer_id, bool):
+            errors.append(
+                {"index": index, "field": "id", "message": "'id' must be an integer."}
+            )
+
+        values = update.get("values")
+        if not isinstance(values, dict) or not values:
+            errors.append(
+                {
+                    "index": index,
+                    "field": "values",
+                    "message": "'values' must be a dictionary with at least 1 key: value.",
+                }
+            )
+            continue
+
+        normalized.append(
+            {"id": customer_id, "values": normalize_values(values, index, errors)}
+        )
+    return normalized, errors
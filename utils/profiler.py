@@ -0,0 +1,175 @@
+# utils/profiler.py
+import os
+import sys
+import hmac
+import time
+import uuid
+import random
+import logging
+import cProfile
+import threading
+from collections import Counter
+
+from flask import request, g
+
+# Profiling is off unless a token or a sample rate is configured
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0") or 0)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "pstats")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005") or 0.005)
+PROFILE_HEADER = "X-Profile-Token"
+
+# Only one cProfile session can run at a time (Python 3.12+ allows a single profiler per process)
+cprofile_lock = threading.Lock()
+
+
+class StackSampler:
+    """
+    Samples the stack of a single thread at a fixed interval.
+
+    Each sample is stored as a collapsed stack ("outer;inner;leaf"), which is
+    the input format expected by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, "w") as file:
+            for stack, count in self.samples.items():
+                file.write(f"{stack} {count}\n")
+
+
+def should_profile():
+    """
+    Decide whether the current request should be profiled.
+    A request is profiled if it carries the configured token in the
+    X-Profile-Token header, or if it is picked by the sample rate.
+    Returns:
+        bool: True if the request should be profiled.
+    """
+    if PROFILE_TOKEN:
+        token = request.headers.get(PROFILE_HEADER)
+        # compare_digest only accepts ASCII str, so compare the UTF-8 bytes
+        if token and hmac.compare_digest(
+            token.encode("utf-8"), PROFILE_TOKEN.encode("utf-8")
+        ):
+            return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def start_profiling():
+    """
+    Start a profiler for the current request if it should be profiled.
+    The profiler is stored on flask.g so it can be stopped after the request.
+    A cProfile request is skipped if another request is already being profiled with cProfile.
+    Errors are logged and never fail the request itself.
+    """
+    try:
+        if not should_profile():
+            return
+
+        if PROFILE_FORMAT == "collapsed":
+            profiler = StackSampler(threading.get_ident())
+            profiler.start()
+        else:
+            if not cprofile_lock.acquire(blocking=False):
+                logging.info(
+                    f"Skipping profile for {request.path}, another profile is running \n"
+                )
+                return
+            try:
+                profiler = cProfile.Profile()
+                profiler.enable()
+            except Exception:
+                cprofile_lock.release()
+                raise
+
+        g.profiler = profiler
+        g.profile_started = time.time()
+    except Exception as e:
+        logging.error(f"Error starting profile for {request.path}: {e}\n")
+
+
+def stop_profiling(exc=None):
+    """
+    Stop the profiler for the current request (if any) and write the profile to PROFILE_DIR.
+    Runs on request teardown so the profiler is stopped even if the request raised.
+    Files are named <timestamp>-<method>-<endpoint>-<random>.<ext> with .prof for pstats
+    (readable with pstats/snakeviz) and .folded for collapsed stacks (readable with flamegraph.pl).
+    Args:
+        exc: The exception raised by the request, if any.
+    """
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return
+
+    started = g.pop("profile_started")
+    endpoint = (request.endpoint or "unknown").replace(".", "_")
+    # The random suffix keeps concurrent requests from overwriting each other's profiles
+    name = f"{int(started * 1000)}-{request.method}-{endpoint}-{uuid.uuid4().hex[:8]}"
+
+    # Stop the profiler first so it never outlives the request, even if writing fails
+    if isinstance(profiler, StackSampler):
+        profiler.stop()
+    else:
+        try:
+            profiler.disable()
+        finally:
+            cprofile_lock.release()
+
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        if isinstance(profiler, StackSampler):
+            path = os.path.join(PROFILE_DIR, f"{name}.folded")
+            profiler.dump(path)
+        else:
+            path = os.path.join(PROFILE_DIR, f"{name}.prof")
+            profiler.dump_stats(path)
+        logging.info(
+            f"Profile for {request.method} {request.path} written to {path} "
+            f"({time.time() - started:.3f}s) \n"
+        )
+    except Exception as e:
+        logging.error(f"Error writing profile for {request.path}: {e}\n")
+
+
+def init_profiling(app):
+    """
+    Register the profiling hooks on the Flask app.
+    Nothing is registered when neither PROFILE_TOKEN nor PROFILE_SAMPLE_RATE is set,
+    so there is no per-request overhead when profiling is disabled.
+    Args:
+        app (Flask): The Flask application.
+    """
+    if not PROFILE_TOKEN and PROFILE_SAMPLE_RATE <= 0:
+        return
+
+    app.before_request(start_profiling)
+    app.teardown_request(stop_profiling)
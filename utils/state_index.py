@@ -0,0 +1,179 @@
+# utils/state_index.py
+import os
+import json
+import bisect
+import logging
+import threading
+
+# How often (in seconds) the index is rebuilt from Odoo
+STATES_REFRESH_INTERVAL = float(os.getenv("STATES_REFRESH_INTERVAL", "3600") or 3600)
+
+
+def serialize(states):
+    """
+    Serialize a list of states to JSON bytes.
+    """
+    return json.dumps(states, separators=(",", ":")).encode("utf-8")
+
+
+class StateIndex:
+    """
+    In-memory index of res.country.state records.
+
+    The index is built from a single search_read and swapped in as a whole on each refresh,
+    so requests never see a half-built index. Responses for all states and for each country
+    are serialized once per refresh.
+    """
+
+    def __init__(self, client, interval=STATES_REFRESH_INTERVAL):
+        if interval <= 0:
+            raise ValueError(
+                f"STATES_REFRESH_INTERVAL must be greater than 0, got {interval}"
+            )
+        self.client = client
+        self.interval = interval
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def refresh(self):
+        """
+        Fetch all states from Odoo and rebuild the index.
+        """
+        states = self.client.execute(
+            "res.country.state",
+            "search_read",
+            [],
+            ["id", "name", "country_id"],
+        )
+        states.sort(key=lambda state: (state["name"].lower(), state["id"]))
+
+        names = [state["name"].lower() for state in states]
+        by_id = {state["id"]: state for state in states}
+        by_country = {}
+        country_ids = {}
+        for state in states:
+            # country_id comes back from Odoo as [id, name] or False
+            if not state["country_id"]:
+                continue
+            country_id, country_name = state["country_id"]
+            by_country.setdefault(country_id, []).append(state)
+            country_ids[country_name.lower()] = country_id
+
+        self._snapshot = {
+            "states": states,
+            "names": names,
+            "by_id": by_id,
+            "by_country": by_country,
+            "country_ids": country_ids,
+            "all_bytes": serialize(states),
+            "country_bytes": {
+                country_id: serialize(country_states)
+                for country_id, country_states in by_country.items()
+            },
+        }
+        logging.info(f"State index refreshed with {len(states)} states \n")
+
+    def snapshot(self):
+        """
+        Return the current index, building it on first use if it could not be built at startup.
+        """
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self.refresh()
+        return self._snapshot
+
+    def start_refresh(self):
+        """
+        Build the index now, then rebuild it every STATES_REFRESH_INTERVAL seconds in a background timer.
+        Errors are logged and the previous index is kept.
+        Calling this again (e.g. from a second create_app) does not start another timer.
+        """
+        if self._timer is not None:
+            return
+        self.try_refresh()
+        self.schedule_refresh()
+
+    def try_refresh(self):
+        """
+        Rebuild the index, logging any error instead of raising it.
+        """
+        try:
+            self.refresh()
+        except Exception as e:
+            logging.error(f"Error refreshing state index: {e}\n")
+
+    def schedule_refresh(self):
+        """
+        Schedule the next rebuild of the index after STATES_REFRESH_INTERVAL seconds.
+        """
+
+        def run():
+            self.try_refresh()
+            self.schedule_refresh()
+
+        self._timer = threading.Timer(self.interval, run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def country_id(self, country):
+        """
+        Resolve a country filter given as an ID or a (case-insensitive) name.
+        Returns:
+            int: The country ID, or None if the country is unknown.
+        """
+        snapshot = self.snapshot()
+        if str(country).isdecimal():
+            return int(country)
+        return snapshot["country_ids"].get(str(country).lower())
+
+    def search(self, name=None, state_id=None, country_id=None, match="substring"):
+        """
+        Search the index.
+        Args:
+            name (str, optional): Case-insensitive name to match.
+            state_id (int, optional): ID of the state.
+            country_id (int, optional): ID of the country the states belong to.
+            match (str): "prefix" or "substring" matching for name.
+        Returns:
+            list: The matching states, sorted by name.
+        """
+        snapshot = self.snapshot()
+
+        if state_id is not None:
+            state = snapshot["by_id"].get(state_id)
+            states = [state] if state else []
+        elif country_id is not None:
+            states = snapshot["by_country"].get(country_id, [])
+        else:
+            states = snapshot["states"]
+
+        if state_id is not None and country_id is not None:
+            states = [
+                state
+                for state in states
+                if state["country_id"] and state["country_id"][0] == country_id
+            ]
+
+        if not name:
+            return states
+
+        name = name.lower()
+        if match == "prefix" and states is snapshot["states"]:
+            # names are sorted, so all prefix matches are in one contiguous range
+            start = bisect.bisect_left(snapshot["names"], name)
+            end = bisect.bisect_left(snapshot["names"], name + "\uffff", start)
+            return states[start:end]
+        if match == "prefix":
+            return [state for state in states if state["name"].lower().startswith(name)]
+        return [state for state in states if name in state["name"].lower()]
+
+    def cached_bytes(self, country_id=None):
+        """
+        Return the pre-serialized response for all states or for a single country.
+        """
+        snapshot = self.snapshot()
+        if country_id is None:
+            return snapshot["all_bytes"]
+        return snapshot["country_bytes"].get(country_id, b"[]")